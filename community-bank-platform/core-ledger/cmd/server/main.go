@@ -3,10 +3,12 @@ package main
 import (
 	"context"
 	"log"
+	"net"
 	"net/http"
 	"os"
 	"runtime"
 	"strconv"
+	"strings"
 	"time"
 
 	"core-ledger/internal/httpapi"
@@ -118,5 +120,16 @@ func main() {
 		addr,
 	)
 
+	// LEDGER_HTTP_ADDR=unix:/path/to.sock serves over a UNIX-domain
+	// socket: same HTTP, no TCP stack between co-located processes.
+	if path, ok := strings.CutPrefix(addr, "unix:"); ok {
+		_ = os.Remove(path) // stale socket from a previous run
+		ln, err := net.Listen("unix", path)
+		if err != nil {
+			log.Fatalf("[startup] unix listen failed: %v", err)
+		}
+		log.Fatal(srv.Serve(ln))
+	}
+
 	log.Fatal(srv.ListenAndServe())
 }
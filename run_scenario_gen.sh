@@ -0,0 +1,44 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# run_scenario_gen.sh
+#
+# Purpose:
+# - run scripts/generate_and_run.py against a live ledger
+# - pick the fastest available Python automatically: the generator's hot
+#   loops are pure Python when numpy is absent, where PyPy's JIT or a
+#   free-threaded (3.13t) CPython build helps most
+#
+# Usage:
+#   ./run_scenario_gen.sh
+#
+# Options (env):
+#   GEN_PYTHON=...   (interpreter override, e.g. GEN_PYTHON=pypy3)
+#   GEN_CONFIG=...   (default: scripts/scenario.yaml)
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+GEN_CONFIG="${GEN_CONFIG:-${ROOT_DIR}/scripts/scenario.yaml}"
+
+pick_python() {
+  if [ -n "${GEN_PYTHON:-}" ]; then
+    echo "${GEN_PYTHON}"
+    return 0
+  fi
+  for cand in pypy3 python3.13t python3; do
+    if command -v "${cand}" >/dev/null 2>&1; then
+      echo "${cand}"
+      return 0
+    fi
+  done
+  echo "Missing dependency: python3" >&2
+  exit 1
+}
+
+PY="$(pick_python)"
+echo "==> scenario generator"
+echo "interpreter=$("${PY}" -V 2>&1)"
+echo "config=${GEN_CONFIG}"
+
+# Optional accelerators (aiohttp/numpy/orjson) may be missing under
+# alternative interpreters; the generator degrades to its stdlib paths.
+exec "${PY}" "${ROOT_DIR}/scripts/generate_and_run.py" --config "${GEN_CONFIG}"
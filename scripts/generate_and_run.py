@@ -0,0 +1,803 @@
+#!/usr/bin/env python3
+"""Deterministic traffic generator for the core-ledger HTTP API.
+
+Drives POST /v1/accounts and POST /v1/transfers with reproducible
+pseudo-random load: one funding (SYSTEM) account, per-org operating
+accounts, daily mints, and peer-to-peer transfers. All randomness comes
+from a single seeded RNG, and every write carries a stable idempotency
+key derived from (prefix, day, slot), so a re-run replays instead of
+double-posting. Account ids are the one non-deterministic input (the
+server mints UUIDs), so with idem_cache enabled the label -> account_id
+responses are persisted alongside the key cache and reused on re-runs.
+
+Dispatch is async: per-day operation parameters are drawn up front on
+the main thread (so idempotency-key ordering stays reproducible), then
+the day's requests are overlapped with asyncio.gather under a
+Semaphore, capped to match the server's LEDGER_HTTP_MAX_INFLIGHT edge
+limit.
+
+Usage:
+    python3 scripts/generate_and_run.py [--config scripts/scenario.yaml]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:  # sync fallback below
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 -- httpx's optional http2 extra
+except ImportError:
+    h2 = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _parse_response(raw: bytes) -> dict:
+    """Decode a response body without trusting its content type.
+
+    Routes the server doesn't have — e.g. the /v1/tx/batch capability
+    probe against this repo's own ledger — come back from Go's ServeMux
+    as text/plain ("404 page not found"), so anything that is not a
+    JSON object is wrapped as an error dict instead of raising mid-run.
+    """
+    try:
+        body = json.loads(raw)
+    except ValueError:
+        return {"error": raw.decode("utf-8", "replace").strip()}
+    if isinstance(body, dict):
+        return body
+    return {"error": body}
+
+# libyaml-backed loader when PyYAML was built with it; the pure-Python
+# SafeLoader otherwise. Same parse, less start-up time.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass(frozen=True)
+class Config:
+    base_url: str = "http://localhost:8080"
+    seed: int = 1
+    days: int = 30
+    orgs: int = 8
+    accounts: int = 200
+    daily_transfer_prob: float = 0.35
+    mint_cents: int = 100_000
+    max_transfer_cents: int = 20_000
+    currency: str = "EUR"
+    idem_prefix: str = "gen"
+    concurrency: int = 64
+    max_batch: int = 500
+    transport: str = "auto"  # auto | aiohttp | httpx | sync
+    uds: str = ""  # UNIX socket path of a ledger started with unix:...
+    idem_cache: bool = True  # persist confirmed keys across runs
+    export_ops: bool = False  # per-day columnar op artifacts (pyarrow)
+    inputs: tuple[str, ...] = ()
+    out_dir: str = "demo_out"
+
+
+def load_config(path: Path | None) -> Config:
+    if path is None:
+        return Config()
+    raw = yaml.load(path.read_text(), Loader=_YAML_LOADER) or {}
+    known = {f.name for f in fields(Config)}
+    unknown = set(raw) - known
+    if unknown:
+        raise SystemExit(f"unknown config keys: {sorted(unknown)}")
+    if "inputs" in raw:
+        raw["inputs"] = tuple(raw["inputs"])
+    return Config(**raw)
+
+
+def sha256_file(path: Path) -> str:
+    with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # 3.11+: C read loop, no GIL
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        try:
+            # Let the page cache feed one C-level update instead of
+            # copying 1 MiB chunks through Python.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(memoryview(mm))
+        except (ValueError, OSError):  # empty file, or fd not mappable
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+
+def sha256_file_cached(path: Path, cache: dict) -> str:
+    """sha256_file, but an unchanged file costs a stat() instead of a
+    full read.
+
+    cache maps str(path) -> [inode, size, mtime_ns, digest]; if any of
+    the identity triple moved, the entry is stale and the file is
+    rehashed.
+    """
+    st = path.stat()
+    sig = [st.st_ino, st.st_size, st.st_mtime_ns]
+    ent = cache.get(str(path))
+    if ent is not None and ent[:3] == sig:
+        return ent[3]
+    digest = sha256_file(path)
+    cache[str(path)] = sig + [digest]
+    return digest
+
+
+def write_manifest(cfg: Config) -> None:
+    """Record sha256 of every reference input so a run is auditable.
+
+    SHA-256 over one stream is inherently sequential, so the win here is
+    hashing the input *files* in parallel: file_digest releases the GIL,
+    letting reads and hashing of different files overlap. A stat-keyed
+    sidecar (out_dir/.sha256cache) skips rehashing inputs that have not
+    changed since the previous run.
+    """
+    out_dir = Path(cfg.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = out_dir / ".sha256cache"
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (FileNotFoundError, ValueError):
+        cache = {}
+    paths = [Path(rel) for rel in cfg.inputs]
+    if len(paths) > 1:
+        pool = ThreadPoolExecutor(
+            max_workers=min(len(paths), os.cpu_count() or 1))
+        # Lazy and order-preserving; workers touch distinct cache keys.
+        digests = pool.map(lambda p: sha256_file_cached(p, cache), paths)
+    else:
+        digests = (sha256_file_cached(p, cache) for p in paths)
+        pool = None
+
+    # Single pass: each line goes to disk as its digest completes, and
+    # the manifest's own fingerprint accumulates alongside — no second
+    # read of inputs.txt to hash it.
+    manifest_h = hashlib.sha256()
+    n = 0
+    with (out_dir / "inputs.txt").open("w") as mf:
+        for digest, p in zip(digests, paths):
+            line = f"{digest}  {p}\n"
+            mf.write(line)
+            manifest_h.update(line.encode())
+            n += 1
+    if pool is not None:
+        pool.shutdown()
+    tmp = cache_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache))
+    tmp.replace(cache_path)
+    print(f"[gen] manifest: {n} input(s) -> {out_dir / 'inputs.txt'} "
+          f"(sha256 {manifest_h.hexdigest()})")
+
+
+class LedgerClient:
+    """Thin async client for the ledger HTTP API.
+
+    One keep-alive session, one connection pool; concurrency is bounded
+    by a semaphore so we never exceed the server's in-flight limit.
+    """
+
+    def __init__(self, base_url: str, session: aiohttp.ClientSession,
+                 sem: asyncio.Semaphore):
+        self._url = base_url.rstrip("/")
+        self._session = session
+        self._sem = sem
+
+    async def _raw_post(self, path: str, payload: dict) -> tuple[int, dict]:
+        # Serialize once up front (orjson when available) instead of
+        # letting the session re-encode per request.
+        async with self._sem:
+            async with self._session.post(self._url + path,
+                                          data=_dumps(payload),
+                                          headers=_JSON_HEADERS) as resp:
+                return resp.status, _parse_response(await resp.read())
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        status, body = await self._raw_post(path, payload)
+        if status not in (200, 201):
+            raise RuntimeError(
+                f"POST {path} -> {status}: {body.get('error', body)}")
+        return body
+
+    async def create_account(self, label: str, currency: str) -> str:
+        body = await self._post("/v1/accounts",
+                                {"label": label, "currency": currency})
+        return body["account_id"]
+
+    async def mint(self, system_id: str, to_id: str, amount_cents: int,
+                   currency: str, idem: str) -> str:
+        return await self.transfer(system_id, to_id, amount_cents,
+                                   currency, idem)
+
+    async def transfer(self, from_id: str, to_id: str, amount_cents: int,
+                       currency: str, idem: str) -> str:
+        body = await self._post("/v1/transfers", {
+            "from_account_id": from_id,
+            "to_account_id": to_id,
+            "amount_cents": amount_cents,
+            "currency": currency,
+            "external_ref": idem,
+            "idempotency_key": idem,
+            "correlation_id": idem,
+        })
+        return body["tx_id"]
+
+    async def transfer_batch(self, currency: str, ops: list[dict]) -> dict:
+        """POST one JSON array of transfer ops to /v1/tx/batch.
+
+        Each op keeps its own idempotency_key so a server-side retry of
+        the whole batch stays safe.
+        """
+        return await self._post("/v1/tx/batch",
+                                {"currency": currency, "ops": ops})
+
+    async def supports_batch(self) -> bool:
+        """Probe /v1/tx/batch once; older servers answer 404/405."""
+        status, _ = await self._raw_post("/v1/tx/batch", {"ops": []})
+        return status not in (404, 405)
+
+
+class HttpxLedgerClient(LedgerClient):
+    """LedgerClient over httpx.AsyncClient, HTTP/2 when h2 is installed.
+
+    When the ledger sits behind a TLS/h2-capable proxy all in-flight
+    requests multiplex as streams on one connection; against the plain
+    h1 server httpx simply negotiates HTTP/1.1 with the same pool.
+    """
+
+    async def _raw_post(self, path: str, payload: dict) -> tuple[int, dict]:
+        async with self._sem:
+            resp = await self._session.post(self._url + path,
+                                            content=_dumps(payload),
+                                            headers=_JSON_HEADERS)
+            return resp.status_code, _parse_response(resp.content)
+
+
+class SyncLedgerClient:
+    """requests-based fallback used when aiohttp is not installed.
+
+    run_sync fans ops out across a thread pool, so the mounted adapter
+    is sized well above the default 10-socket HTTPAdapter pool (which
+    retries nothing) and adds retries on transient gateway errors.
+    """
+
+    # (connect, read) seconds; the Retry above never fires on a hung
+    # socket, so without this a stalled ledger blocks the run forever.
+    TIMEOUT = (5, 30)
+
+    def __init__(self, base_url: str):
+        self._url = base_url.rstrip("/")
+        self.s = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=128,
+            pool_block=False,
+            max_retries=Retry(total=3, backoff_factor=0.1,
+                              status_forcelist=(502, 503, 504),
+                              allowed_methods=None),
+        )
+        self.s.mount("http://", adapter)
+        self.s.mount("https://", adapter)
+        self.s.headers["Connection"] = "keep-alive"
+
+    def _post(self, path: str, payload: dict) -> dict:
+        resp = self.s.post(self._url + path, data=_dumps(payload),
+                           headers=_JSON_HEADERS, timeout=self.TIMEOUT)
+        body = _parse_response(resp.content)
+        if resp.status_code not in (200, 201):
+            raise RuntimeError(
+                f"POST {path} -> {resp.status_code}: {body.get('error', body)}")
+        return body
+
+    def create_account(self, label: str, currency: str) -> str:
+        body = self._post("/v1/accounts",
+                          {"label": label, "currency": currency})
+        return body["account_id"]
+
+    def transfer(self, from_id: str, to_id: str, amount_cents: int,
+                 currency: str, idem: str) -> str:
+        body = self._post("/v1/transfers", {
+            "from_account_id": from_id,
+            "to_account_id": to_id,
+            "amount_cents": amount_cents,
+            "currency": currency,
+            "external_ref": idem,
+            "idempotency_key": idem,
+            "correlation_id": idem,
+        })
+        return body["tx_id"]
+
+    def transfer_batch(self, currency: str, ops: list[dict]) -> dict:
+        return self._post("/v1/tx/batch", {"currency": currency, "ops": ops})
+
+    def supports_batch(self) -> bool:
+        resp = self.s.post(self._url + "/v1/tx/batch",
+                           data=_dumps({"ops": []}), headers=_JSON_HEADERS,
+                           timeout=self.TIMEOUT)
+        return resp.status_code not in (404, 405)
+
+
+def load_account_cache(path: Path | None) -> dict[str, str]:
+    """label -> account_id map persisted from a previous run.
+
+    Without it a re-run would create fresh account UUIDs while the key
+    cache skips the mints/transfers, and ops that do go out would 409
+    against the idempotency table (same keys, different accounts).
+    """
+    if path is None:
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_account_cache(path: Path | None, accounts: dict[str, str]) -> None:
+    if path is None:
+        return
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(accounts))
+    tmp.replace(path)
+
+
+def account_labels(cfg: Config) -> list[str]:
+    return ["SYSTEM"] + [f"acct-{i:05d}" for i in range(cfg.accounts)]
+
+
+def batch_op(frm: str, to: str, amount_cents: int, idem: str) -> dict:
+    return {
+        "from_account_id": frm,
+        "to_account_id": to,
+        "amount_cents": amount_cents,
+        "idempotency_key": idem,
+    }
+
+
+def write_ops_parquet(out_dir: Path, day: int, ops: list[tuple]) -> None:
+    """Write one day's ops as a columnar (SoA) Parquet artifact.
+
+    The wire format to the ledger stays JSON — this is the audit/replay
+    copy: four flat columns instead of a list of dicts, so downstream
+    tooling can scan amounts or join on idempotency keys without
+    re-parsing request payloads.
+    """
+    if pa is None:
+        return
+    frm, to, amounts, idems = (map(list, zip(*ops))
+                               if ops else ([], [], [], []))
+    table = pa.table({
+        "from_account_id": frm,
+        "to_account_id": to,
+        "amount_cents": amounts,
+        "idempotency_key": idems,
+    })
+    pq.write_table(table, out_dir / f"ops_d{day:04d}.parquet")
+
+
+def make_rng(seed: int):
+    """One seeded RNG for the whole run.
+
+    numpy's Generator when available (bulk draws below), else
+    random.Random. The two backends produce different — but each fully
+    deterministic — streams for the same seed.
+    """
+    if np is not None:
+        return np.random.default_rng(seed)
+    return random.Random(seed)
+
+
+def iter_day_ops(cfg: Config, rng, day: int,
+                 system_id: str, account_ids: list[str]):
+    """Yield one day's (from, to, amount, idem) tuples.
+
+    Single-threaded on purpose: the (day, slot) order — and with it each
+    idempotency key — must not depend on dispatch completion order.
+    Yielding (rather than returning a list) keeps memory flat on large
+    days; the Collector downstream bounds how much is buffered.
+    """
+    # Precompute full per-day key templates; each op then does a single
+    # C-level "%d" substitution instead of str(i) plus a concat.
+    mint_tmpl = f"{cfg.idem_prefix}:d{day}:m%d"
+    xfer_tmpl = f"{cfg.idem_prefix}:d{day}:t%d"
+
+    # Bind hot names to locals: the loops below run accounts * days
+    # times and LOAD_FAST beats repeated attribute/global lookups.
+    aids = account_ids
+    n = cfg.accounts
+    mint_cents = cfg.mint_cents
+
+    if np is not None:
+        # One bulk draw per parameter instead of accounts+orgs scalar
+        # calls through the Python RNG. The sender set comes from one
+        # binomial draw plus a direct k-out-of-n index sample — same
+        # distribution as gating each account on rng.random() < p, but
+        # the non-senders never touch the RNG.
+        mint_to = rng.integers(0, n, size=cfg.orgs)
+        k = int(rng.binomial(n, cfg.daily_transfer_prob))
+        senders = np.sort(rng.choice(n, size=k, replace=False))
+        # Draw partners from the n-1 values != sender directly: pick in
+        # [0, n-1) and shift the values at or above the sender up by
+        # one. Uniform over valid partners, no rejection resampling.
+        partners = rng.integers(0, n - 1, size=k)
+        partners = np.where(partners >= senders, partners + 1, partners)
+        amounts = rng.integers(1, cfg.max_transfer_cents + 1, size=k)
+        for org in range(cfg.orgs):
+            yield (system_id, aids[int(mint_to[org])],
+                   mint_cents, mint_tmpl % org)
+        # Pull the arrays into plain lists once; per-element .item()
+        # style conversions inside the loop cost more than the copy.
+        senders = senders.tolist()
+        partners = partners.tolist()
+        amounts = amounts.tolist()
+        for j in range(k):
+            yield (aids[senders[j]], aids[partners[j]], amounts[j],
+                   xfer_tmpl % senders[j])
+        return
+
+    randrange = rng.randrange
+    for org in range(cfg.orgs):
+        to = randrange(n)
+        yield (system_id, aids[to], mint_cents, mint_tmpl % org)
+    if hasattr(random, "binomialvariate"):  # 3.12+: same trick, scalar RNG
+        k = rng.binomialvariate(n, cfg.daily_transfer_prob)
+        senders = sorted(rng.sample(range(n), k))
+    else:
+        senders = [i for i in range(n)
+                   if rng.random() < cfg.daily_transfer_prob]
+    randint = rng.randint
+    max_cents = cfg.max_transfer_cents
+    for i in senders:
+        to = randrange(n - 1)
+        if to >= i:  # same shift trick as the vectorized path
+            to += 1
+        yield (aids[i], aids[to], randint(1, max_cents),
+               xfer_tmpl % i)
+
+
+class SeenKeys:
+    """Bounded LRU of idempotency keys the ledger already confirmed.
+
+    Replaying an op whose key is here would only fetch the same tx_id
+    back, so the POST can be skipped outright. Bounded so multi-week
+    runs cannot grow it without limit; a miss is always safe because
+    the server's idempotency table stays the source of truth.
+
+    load()/save() persist the cache as a JSON array of keys, so a
+    re-run of the same scenario skips HTTP for everything it already
+    committed. Confirmation is all the generator ever needs — it never
+    reads replayed tx_ids — so no responses are stored.
+    """
+
+    def __init__(self, max_size: int = 1 << 20):
+        self._d: OrderedDict[str, None] = OrderedDict()
+        self._max = max_size
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._d:
+            self._d.move_to_end(key)
+            return True
+        return False
+
+    def add(self, key: str) -> None:
+        self._d[key] = None
+        self._d.move_to_end(key)
+        if len(self._d) > self._max:
+            self._d.popitem(last=False)
+
+    def load(self, path: Path) -> int:
+        try:
+            raw = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return 0
+        # Iterating covers both the array format and the legacy
+        # key -> tx_id map.
+        n = 0
+        for key in raw:
+            self.add(key)
+            n += 1
+        return n
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(list(self._d)))
+        tmp.replace(path)  # atomic: a crash never truncates the cache
+
+
+class Collector:
+    """Bounded op buffer with size + time auto-flush.
+
+    add() hands the buffer to the flush callback once max_size ops have
+    accumulated or max_wait seconds have passed since the first buffered
+    op — caps generator-side memory and smooths bursts into steady
+    batches the ledger can absorb.
+    """
+
+    def __init__(self, flush, max_size: int = 500, max_wait: float = 0.05):
+        self._flush_fn = flush
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.buf: list[tuple] = []
+        self._t0 = 0.0
+
+    def add(self, op: tuple) -> None:
+        if not self.buf:
+            self._t0 = time.monotonic()
+        self.buf.append(op)
+        if (len(self.buf) >= self.max_size
+                or time.monotonic() - self._t0 > self.max_wait):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buf:
+            self._flush_fn(self.buf)
+            self.buf = []
+
+
+def run_sync(cfg: Config) -> None:
+    if cfg.uds:
+        raise SystemExit("uds requires an async transport (aiohttp or httpx)")
+    rng = make_rng(cfg.seed)
+    lc = SyncLedgerClient(cfg.base_url)
+
+    acct_path = (Path(cfg.out_dir) / "account_cache.json"
+                 if cfg.idem_cache else None)
+    accounts = load_account_cache(acct_path)
+    labels = account_labels(cfg)
+    missing = [label for label in labels if label not in accounts]
+    print(f"[gen] accounts: {len(labels) - len(missing)} reused, "
+          f"{len(missing)} to create (sync fallback)")
+    for label in missing:
+        accounts[label] = lc.create_account(label, cfg.currency)
+    if missing:
+        save_account_cache(acct_path, accounts)
+    system_id = accounts["SYSTEM"]
+    account_ids = [accounts[label] for label in labels[1:]]
+
+    use_batch = lc.supports_batch()
+    print(f"[gen] /v1/tx/batch supported: {use_batch}")
+
+    seen = SeenKeys()
+    cache_path = Path(cfg.out_dir) / "idem_cache.json" if cfg.idem_cache else None
+    if cache_path is not None:
+        n_cached = seen.load(cache_path)
+        if n_cached:
+            print(f"[gen] idem cache: {n_cached} confirmed key(s) loaded")
+
+    pool = ThreadPoolExecutor(max_workers=cfg.concurrency)
+
+    def dispatch(ops: list[tuple]) -> None:
+        ops = [op for op in ops if op[3] not in seen]
+        if not ops:
+            return
+        if use_batch:
+            lc.transfer_batch(cfg.currency, [batch_op(*op) for op in ops])
+        else:
+            # Fan the flushed buffer out across threads: requests
+            # releases the GIL while blocked on the socket, and on a
+            # free-threaded (3.13t) build the sends run truly in
+            # parallel. pool.map re-raises the first failure.
+            list(pool.map(
+                lambda op: lc.transfer(op[0], op[1], op[2],
+                                       cfg.currency, op[3]),
+                ops))
+        for op in ops:
+            seen.add(op[3])
+
+    collector = Collector(dispatch, max_size=cfg.max_batch)
+
+    export_dir = Path(cfg.out_dir) if cfg.export_ops and pa is not None else None
+    if cfg.export_ops and pa is None:
+        print("[gen] export_ops set but pyarrow is missing; no op artifacts")
+
+    t0 = time.monotonic()
+    n_tx = 0
+    try:
+        for day in range(cfg.days):
+            n_ops = 0
+            day_ops: list[tuple] | None = [] if export_dir is not None else None
+            for op in iter_day_ops(cfg, rng, day, system_id, account_ids):
+                collector.add(op)
+                if day_ops is not None:
+                    day_ops.append(op)
+                n_ops += 1
+            collector.flush()
+            if day_ops is not None:
+                write_ops_parquet(export_dir, day, day_ops)
+            n_tx += n_ops
+            print(f"[gen] day {day + 1}/{cfg.days}: {n_ops} ops")
+    finally:
+        pool.shutdown()
+        # Persist even on failure: confirmed work survives for the
+        # retried run to skip.
+        if cache_path is not None:
+            seen.save(cache_path)
+
+    dt = time.monotonic() - t0
+    print(f"[gen] done: {n_tx} tx in {dt:.2f}s ({n_tx / dt:.0f} tps)")
+
+
+def pick_transport(cfg: Config) -> str:
+    if cfg.transport != "auto":
+        return cfg.transport
+    if aiohttp is not None:
+        return "aiohttp"
+    if httpx is not None:
+        return "httpx"
+    return "sync"
+
+
+async def run(cfg: Config) -> None:
+    rng = make_rng(cfg.seed)
+    sem = asyncio.Semaphore(cfg.concurrency)
+    transport = pick_transport(cfg)
+    if transport == "httpx":
+        if httpx is None:
+            raise SystemExit("transport=httpx but httpx is not installed")
+        limits = httpx.Limits(max_connections=cfg.concurrency,
+                              keepalive_expiry=60)
+        # http2=True without the h2 extra raises at client build time.
+        if h2 is None:
+            print("[gen] httpx h2 extra not installed; staying on HTTP/1.1")
+        kwargs = {"http2": h2 is not None, "limits": limits}
+        if cfg.uds:
+            # Skip the TCP stack for a co-located ledger; base_url only
+            # supplies the Host header then.
+            kwargs["transport"] = httpx.AsyncHTTPTransport(uds=cfg.uds)
+        async with httpx.AsyncClient(**kwargs) as session:
+            await drive(cfg, rng, HttpxLedgerClient(cfg.base_url, session, sem))
+        return
+    if cfg.uds:
+        connector = aiohttp.UnixConnector(path=cfg.uds,
+                                          limit=cfg.concurrency,
+                                          keepalive_timeout=60)
+    else:
+        connector = aiohttp.TCPConnector(limit=cfg.concurrency,
+                                         keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await drive(cfg, rng, LedgerClient(cfg.base_url, session, sem))
+
+
+async def drive(cfg: Config, rng, lc: LedgerClient) -> None:
+    acct_path = (Path(cfg.out_dir) / "account_cache.json"
+                 if cfg.idem_cache else None)
+    accounts = load_account_cache(acct_path)
+    labels = account_labels(cfg)
+    missing = [label for label in labels if label not in accounts]
+    print(f"[gen] accounts: {len(labels) - len(missing)} reused, "
+          f"{len(missing)} to create")
+    if missing:
+        created = await asyncio.gather(*[
+            lc.create_account(label, cfg.currency) for label in missing
+        ])
+        accounts.update(zip(missing, created))
+        save_account_cache(acct_path, accounts)
+    system_id = accounts["SYSTEM"]
+    account_ids = [accounts[label] for label in labels[1:]]
+
+    use_batch = await lc.supports_batch()
+    print(f"[gen] /v1/tx/batch supported: {use_batch}")
+
+    pending: list[asyncio.Task] = []
+    seen = SeenKeys()
+    in_flight_keys: list[str] = []
+    cache_path = Path(cfg.out_dir) / "idem_cache.json" if cfg.idem_cache else None
+    if cache_path is not None:
+        n_cached = seen.load(cache_path)
+        if n_cached:
+            print(f"[gen] idem cache: {n_cached} confirmed key(s) loaded")
+
+    def dispatch(ops: list[tuple]) -> None:
+        # Hand the flushed buffer off as tasks; the shared semaphore
+        # bounds how many are actually in flight. Ops whose keys were
+        # already confirmed (replayed day, retried run) skip the wire.
+        ops = [op for op in ops if op[3] not in seen]
+        if not ops:
+            return
+        in_flight_keys.extend(op[3] for op in ops)
+        if use_batch:
+            pending.append(asyncio.create_task(lc.transfer_batch(
+                cfg.currency, [batch_op(*op) for op in ops])))
+        else:
+            pending.extend(
+                asyncio.create_task(
+                    lc.transfer(frm, to, amount, cfg.currency, idem))
+                for frm, to, amount, idem in ops)
+
+    collector = Collector(dispatch, max_size=cfg.max_batch)
+
+    export_dir = Path(cfg.out_dir) if cfg.export_ops and pa is not None else None
+    if cfg.export_ops and pa is None:
+        print("[gen] export_ops set but pyarrow is missing; no op artifacts")
+
+    t0 = time.monotonic()
+    n_tx = 0
+    try:
+        for day in range(cfg.days):
+            n_ops = 0
+            day_ops: list[tuple] | None = [] if export_dir is not None else None
+            for op in iter_day_ops(cfg, rng, day, system_id, account_ids):
+                collector.add(op)
+                if day_ops is not None:
+                    day_ops.append(op)
+                n_ops += 1
+            collector.flush()
+            if day_ops is not None:
+                write_ops_parquet(export_dir, day, day_ops)
+            await asyncio.gather(*pending)
+            pending.clear()
+            for key in in_flight_keys:
+                seen.add(key)
+            in_flight_keys.clear()
+            n_tx += n_ops
+            print(f"[gen] day {day + 1}/{cfg.days}: {n_ops} ops")
+    finally:
+        # Persist even on failure: days confirmed before the error are
+        # skipped by the retried run.
+        if cache_path is not None:
+            seen.save(cache_path)
+
+    dt = time.monotonic() - t0
+    print(f"[gen] done: {n_tx} tx in {dt:.2f}s ({n_tx / dt:.0f} tps)")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--config", type=Path, default=None,
+                    help="scenario YAML (defaults baked in)")
+    args = ap.parse_args()
+    cfg = load_config(args.config)
+    write_manifest(cfg)
+    if pick_transport(cfg) == "sync":
+        run_sync(cfg)
+    else:
+        asyncio.run(run(cfg))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
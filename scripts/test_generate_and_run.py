@@ -0,0 +1,122 @@
+"""Tests for scripts/generate_and_run.py.
+
+Run with:
+    python3 -m unittest discover -s scripts -p 'test_*.py'
+"""
+
+import asyncio
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_spec = importlib.util.spec_from_file_location(
+    "generate_and_run", Path(__file__).with_name("generate_and_run.py"))
+gar = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = gar  # dataclasses resolves fields via sys.modules
+_spec.loader.exec_module(gar)
+
+
+class ParseResponseTest(unittest.TestCase):
+    def test_plain_text_404_wraps_as_error(self):
+        # Go's ServeMux answers unknown routes with text/plain; this
+        # must not raise (regression: the batch probe crashed the run).
+        body = gar._parse_response(b"404 page not found\n")
+        self.assertEqual(body, {"error": "404 page not found"})
+
+    def test_json_object_passes_through(self):
+        body = gar._parse_response(b'{"tx_id": "abc"}')
+        self.assertEqual(body, {"tx_id": "abc"})
+
+    def test_json_non_object_wraps_as_error(self):
+        body = gar._parse_response(b'["not", "a", "dict"]')
+        self.assertEqual(body, {"error": ["not", "a", "dict"]})
+
+
+class _FakeResp:
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    def __init__(self, resp: _FakeResp):
+        self._resp = resp
+
+    def post(self, *args, **kwargs):
+        return self._resp
+
+
+class Sha256CacheTest(unittest.TestCase):
+    def test_hit_skips_rehash_and_stale_entry_recomputes(self):
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d) / "ref.csv"
+            p.write_bytes(b"a,b\n1,2\n")
+            st = p.stat()
+            # Matching signature: the sentinel digest proves no rehash.
+            cache = {str(p): [st.st_ino, st.st_size, st.st_mtime_ns,
+                              "sentinel"]}
+            self.assertEqual(gar.sha256_file_cached(p, cache), "sentinel")
+            # Size change invalidates; real digest replaces the entry.
+            p.write_bytes(b"a,b\n1,2\n3,4\n")
+            digest = gar.sha256_file_cached(p, cache)
+            self.assertEqual(digest, gar.sha256_file(p))
+            self.assertEqual(cache[str(p)][3], digest)
+
+
+class SeenKeysTest(unittest.TestCase):
+    def test_round_trip_and_legacy_map_format(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "idem_cache.json"
+            s = gar.SeenKeys()
+            s.add("gen:d0:t1")
+            s.add("gen:d0:t2")
+            s.save(path)
+            s2 = gar.SeenKeys()
+            self.assertEqual(s2.load(path), 2)
+            self.assertIn("gen:d0:t1", s2)
+            self.assertNotIn("gen:d1:t9", s2)
+            # Legacy key -> tx_id map loads the same.
+            path.write_text('{"gen:d2:t3": "tx-3"}')
+            s3 = gar.SeenKeys()
+            self.assertEqual(s3.load(path), 1)
+            self.assertIn("gen:d2:t3", s3)
+            self.assertEqual(gar.SeenKeys().load(Path(d) / "missing.json"), 0)
+
+
+class AccountCacheTest(unittest.TestCase):
+    def test_round_trip_and_disabled_path(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "account_cache.json"
+            gar.save_account_cache(path, {"SYSTEM": "u-0", "acct-00000": "u-1"})
+            cache = gar.load_account_cache(path)
+            self.assertEqual(cache["acct-00000"], "u-1")
+            # None (idem_cache disabled) and a missing file both start empty.
+            self.assertEqual(gar.load_account_cache(None), {})
+            self.assertEqual(gar.load_account_cache(Path(d) / "nope.json"), {})
+
+
+class SupportsBatchProbeTest(unittest.TestCase):
+    def test_probe_survives_plain_text_404(self):
+        session = _FakeSession(_FakeResp(404, b"404 page not found\n"))
+        lc = gar.LedgerClient("http://ledger", session, asyncio.Semaphore(1))
+        self.assertFalse(asyncio.run(lc.supports_batch()))
+
+    def test_probe_accepts_json_answer(self):
+        session = _FakeSession(_FakeResp(200, b'{"results": []}'))
+        lc = gar.LedgerClient("http://ledger", session, asyncio.Semaphore(1))
+        self.assertTrue(asyncio.run(lc.supports_batch()))
+
+
+if __name__ == "__main__":
+    unittest.main()